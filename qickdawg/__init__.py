@@ -1,5 +1,22 @@
 from qickdawg.util import *
-from qickdawg.nvpulsing import *
 from qickdawg.fitfunctions import *
+from qickdawg import nvpulsing
+
+__all__ = [name for name in dir() if not name.startswith('_')] + nvpulsing.__all__
+
+
+def __getattr__(name):
+    # programs are loaded from qickdawg.nvpulsing on first access
+    if name in nvpulsing.__all__:
+        value = getattr(nvpulsing, name)
+        globals()[name] = value  # later lookups skip __getattr__
+
+        return value
+
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
 # Now using QICK 0.2.160 as of 7/03/2023
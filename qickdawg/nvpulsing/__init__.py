@@ -1,22 +1,46 @@
+import importlib
 
-from .nvqicksweep import NVQickSweep
-from .nvconfiguration import NVConfiguration
-from .nvaverageprogram import NVAveragerProgram
-from .nvaverageprogram_johns import NVAveragerProgram_johns
-
-from .laseron import LaserOn, laser_on
-from .laseroff import LaserOff, laser_off
-from .plintensity import PLIntensity
-from .lockinodmr import LockinODMR
-from .odmr_johns import ODMR_johns
-from .readoutwindow import ReadoutWindow
-from .getreadoutwindow import get_readout_window
-
-from .rabisweep import RabiSweep
-from .hahnechodelaysweep import HahnEchoDelaySweep
-from .t1delaysweep import T1DelaySweep
-from .ramsey import Ramsey
-
-from .nvaverageprogram_johns import NVAveragerProgram_johns
-from .lockinodmr_johns import LockinODMR_johns
-from .rabisweep_johns import RabiSweep_johns
\ No newline at end of file
+# Programs are imported on first attribute access (PEP 562) so that
+# importing qickdawg does not load every program module (and serial) up
+# front. Maps each public name to the submodule defining it.
+_lazy_imports = {
+    "NVQickSweep": "nvqicksweep",
+    "NVConfiguration": "nvconfiguration",
+    "NVAveragerProgram": "nvaverageprogram",
+    "NVAveragerProgram_johns": "nvaverageprogram_johns",
+    "NVSaveMixin": "nvsavemixin",
+
+    "LaserOn": "laseron",
+    "laser_on": "laseron",
+    "LaserOff": "laseroff",
+    "laser_off": "laseroff",
+    "PLIntensity": "plintensity",
+    "LockinODMR": "lockinodmr",
+    "ODMR_johns": "odmr_johns",
+    "ReadoutWindow": "readoutwindow",
+    "get_readout_window": "getreadoutwindow",
+
+    "RabiSweep": "rabisweep",
+    "HahnEchoDelaySweep": "hahnechodelaysweep",
+    "T1DelaySweep": "t1delaysweep",
+    "Ramsey": "ramsey",
+
+    "LockinODMR_johns": "lockinodmr_johns",
+    "RabiSweep_johns": "rabisweep_johns",
+}
+
+__all__ = list(_lazy_imports)
+
+
+def __getattr__(name):
+    if name not in _lazy_imports:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    value = getattr(importlib.import_module("." + _lazy_imports[name], __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -10,15 +10,29 @@ while taking the difference between PL for microwave drive on or off
 from qick.averager_program import QickSweep
 from .nvaverageprogram_johns import NVAveragerProgram_johns
 from ..util import ItemAttribute
-import qickdawg as qd
+from .sequencegraphics import GRAPHICS_FOLDER, load_graphic
 
 import numpy as np
 import matplotlib.pyplot as plt
-import matplotlib.image as mpimg
-from datetime import datetime
-import pickle
+from matplotlib.figure import Figure
+from concurrent.futures import ThreadPoolExecutor
 import os 
-import serial
+import warnings
+
+# single worker that writes plots from save() while the next measurement runs
+_save_pool = ThreadPoolExecutor(max_workers=1)
+
+
+def _warn_on_error(future):
+    # background saves are usually not waited on, so surface failures here
+    error = future.exception()
+    if error is not None:
+        warnings.warn("Saving ODMR plots failed: {!r}".format(error), RuntimeWarning)
+
+
+# pulse sequence graphic used by plot_sequence
+_ODMR_PNG = os.path.join(GRAPHICS_FOLDER, 'ODMR.png')
+
 
 class LockinODMR_johns(NVAveragerProgram_johns):
     '''
@@ -145,6 +159,14 @@ class LockinODMR_johns(NVAveragerProgram_johns):
                                  self.cfg.mw_end_fMHz,
                                  self.cfg.nsweep_points))
 
+        # the sweep is fixed once the program is built, so compute its points
+        # and the (rounds*reps, frequencies, signal/reference) shape used by
+        # analyze_results once. Every result shares the frequencies array, so
+        # it is read-only
+        self.frequencies = np.asarray(self.qick_sweeps[0].get_sweep_pts())
+        self.frequencies.flags.writeable = False
+        self.reduce_shape = (-1, self.cfg.nsweep_points, 2)
+
         self.synci(400)  # give processor some time to self.cfgure pulses
 
         if self.cfg.pre_init:
@@ -155,6 +177,18 @@ class LockinODMR_johns(NVAveragerProgram_johns):
                 adc_trig_offset=0)
             self.sync_all(self.cfg.readout_integration_treg + self.cfg.relax_delay_treg)
 
+        # measurement configuration written to Config.txt by save
+        self.config_text = "\n".join([
+            f"Readout time (us): {self.cfg.readout_integration_tus}",
+            f"Relax time (us): {self.cfg.relax_delay_tus}",
+            f"Repetitions: {self.cfg.reps}",
+            f"Laser power: {self.cfg.laser_power}",
+            f"MW gain: {self.cfg.mw_gain}",
+            f"MW start frequency: {self.cfg.mw_start_fMHz}",
+            f"MW end frequency: {self.cfg.mw_end_fMHz}",
+            f"Number of frequencies sampled: {self.cfg.nsweep_points}",
+        ]) + "\n"
+
     def body(self):
         '''
         Method that generates the assembly code that is looped over or repeated.
@@ -164,48 +198,55 @@ class LockinODMR_johns(NVAveragerProgram_johns):
         The second acquisition has the microwave channel off for .cfg.readout_integration_t# and
             averages the adc values over this time
         '''
+        laser_initialize = self.cfg.laser_initialize_treg
+        readout_integration = self.cfg.readout_integration_treg
+        relax_delay = self.cfg.relax_delay_treg
+        mw_channel = self.cfg.mw_channel
+        laser_pin = self.cfg.laser_gate_pmod
+        adc_channel = self.cfg.adc_channel
+
         t = 0
         
         self.trigger(
             adcs=[],
-            pins=[self.cfg.laser_gate_pmod],
-            width=self.cfg.laser_initialize_treg,
+            pins=[laser_pin],
+            width=laser_initialize,
             adc_trig_offset=0,
             t=t)
         
-        t += self.cfg.laser_initialize_treg
+        t += laser_initialize
         
         self.trigger(
-            adcs=[self.cfg.adc_channel],
-            pins=[self.cfg.laser_gate_pmod],
-            width=self.cfg.readout_integration_treg,
+            adcs=[adc_channel],
+            pins=[laser_pin],
+            width=readout_integration,
             adc_trig_offset=0,
             t=t)
         
-        self.pulse(ch=self.cfg.mw_channel, t=t)
+        self.pulse(ch=mw_channel, t=t)
 
-        self.sync_all(self.cfg.relax_delay_treg)
+        self.sync_all(relax_delay)
         self.wait_all()
         
         t = 0
         
         self.trigger(
             adcs=[],
-            pins=[self.cfg.laser_gate_pmod],
-            width=self.cfg.laser_initialize_treg,
+            pins=[laser_pin],
+            width=laser_initialize,
             adc_trig_offset=0,
             t=t)
         
-        t += self.cfg.laser_initialize_treg
+        t += laser_initialize
         
         self.trigger(
-            adcs=[self.cfg.adc_channel],
-            pins=[self.cfg.laser_gate_pmod],
-            width=self.cfg.readout_integration_treg,
+            adcs=[adc_channel],
+            pins=[laser_pin],
+            width=readout_integration,
             adc_trig_offset=0,
             t=t)
 
-        self.sync_all(self.cfg.relax_delay_treg)
+        self.sync_all(relax_delay)
         self.wait_all()
 
     def acquire(self, raw_data=False, *arg, **kwarg):
@@ -234,39 +275,29 @@ class LockinODMR_johns(NVAveragerProgram_johns):
             .reference (nfrequency np.array, adc units) - average adc signal for mwicrowave off
             .odmr (nfrequency np.array, adc units)) - .signal minus .refrence
             .odmr_contrast (nfrequency np.array, % units) - (.signal - .reference)/.reference *100
+                computed from the averaged .signal and .reference
         """
         
-        data = np.reshape(data, self.data_shape)
-        data = data / self.cfg.readout_integration_treg
-        
-        if len(self.data_shape) == 2:
-            signal = data[:, 0]
-            reference = data[:, 1]
-        elif len(self.data_shape) == 3:
-            signal = data[:, :, 0]
-            reference = data[:, :, 1]
-        elif len(self.data_shape) == 4:
-            signal = data[:, :, :, 0]
-            reference = data[:, :, :, 1]
-
-        odmr = (signal - reference)
-        odmr_contrast = (signal - reference) / reference * 100
-
-        for _ in range(len(odmr.shape) - 1):
-            odmr = np.mean(odmr, axis=0)
-            signal = np.mean(signal, axis=0)
-            reference = np.mean(reference, axis=0)
-            odmr_contrast = np.mean(odmr_contrast, axis=0)
-
-        d = ItemAttribute()
-        d.odmr = odmr
-        d.signal = signal
-        d.reference = reference
-        d.odmr_contrast = odmr_contrast
-
-        d.frequencies = self.qick_sweeps[0].get_sweep_pts()
-
-        return d
+        # collapse rounds and reps into one axis so signal and reference are
+        # summed together in a single pass over the data, then average and
+        # normalize by the integration length with one multiply on the sums.
+        # The adc data is int32, so accumulate in float64 to avoid overflow
+        data = np.reshape(data, self.reduce_shape)
+        scale = 1.0 / (data.shape[0] * self.cfg.readout_integration_treg)
+        averaged = np.multiply(data.sum(axis=0, dtype=np.float64), scale)
+
+        signal = averaged[:, 0]
+        reference = averaged[:, 1]
+
+        odmr = np.subtract(signal, reference)
+        odmr_contrast = np.divide(odmr, reference)
+        odmr_contrast *= 100
+
+        return ItemAttribute(odmr=odmr,
+                             signal=signal,
+                             reference=reference,
+                             odmr_contrast=odmr_contrast,
+                             frequencies=self.frequencies)
 
     def time_per_rep(self):
         """
@@ -302,13 +333,10 @@ class LockinODMR_johns(NVAveragerProgram_johns):
             If None, this plots the squence with configuration labels
             If a `.NVConfiguration` object is supplied, the configuraiton value are added to the plot
         '''
-        graphics_folder = os.path.join(os.path.dirname(__file__), '../../graphics')
-        image_path = os.path.join(graphics_folder, 'ODMR.png')
-        
         if cfg is None:
             plt.figure(figsize=(10, 10))
             plt.axis('off')
-            plt.imshow(mpimg.imread(image_path))
+            plt.imshow(load_graphic(_ODMR_PNG))
             plt.text(295, 340, "    config.reps", fontsize=16)
             plt.text(200, 275, "config.readout_integration_t#", fontsize=14)
             plt.text(520, 275, "config.relax_delay_t#", fontsize=14)
@@ -317,14 +345,14 @@ class LockinODMR_johns(NVAveragerProgram_johns):
         else:
             plt.figure(figsize=(10, 10))
             plt.axis('off')
-            plt.imshow(mpimg.imread(image_path))
+            plt.imshow(load_graphic(_ODMR_PNG))
             plt.text(295, 340, "Repeat {} times".format(cfg.reps), fontsize=16)
             plt.text(200, 275, "readout_integration = {} us".format(int(cfg.readout_integration_tus)), fontsize=14)
-            plt.text(520, 290, "relax_delay \n = {} us".format(str(cfg.relax_delay_tus)[:4]), fontsize=14)
-            plt.text(130, 400, "Sweep linearly from {} MHz to {} MHz in steps of {} MHz".format(int(cfg.mw_start_fMHz), int(cfg.mw_end_fMHz), str(cfg.mw_delta_fMHz)[:4]), fontsize=14)
+            plt.text(520, 290, "relax_delay \n = {:g} us".format(cfg.relax_delay_tus), fontsize=14)
+            plt.text(130, 400, "Sweep linearly from {} MHz to {} MHz in steps of {:g} MHz".format(int(cfg.mw_start_fMHz), int(cfg.mw_end_fMHz), cfg.mw_delta_fMHz), fontsize=14)
             plt.title("      ODMR Pulse Sequence", fontsize=20)
             
-    def save(self, data, folder_path = None, folder_name = None, separate_dates = True, additional_configs = []):
+    def save(self, data, folder_path = None, folder_name = None, separate_dates = True, additional_configs = [], background = False):
         '''
         Method that saves a file containing the raw data given as well as two graphs,
         one of the odmr contrast and another showing the reference and signal
@@ -344,43 +372,63 @@ class LockinODMR_johns(NVAveragerProgram_johns):
         additional_configs
             A list of 2 item arrays, with the first item containing the name of the config and the second item containing the 
             value. These will be saved alongside the values in the config item used to generate the data in a text file
-        
+        background
+            Boolean value which if true writes the plots on a worker thread so the next acquire can start.
+            Plotting errors are then reported as warnings
+
+        returns
+            None, or if background is True a (concurrent.futures.Future) that completes once the plots
+            are written
         '''
         
         folder_path = self.init_save(self.cfg, data, folder_path, folder_name, separate_dates)
         
-        # plot the signal and reference and save it
-        
-        plt.plot(data.frequencies, data.signal, label='signal')
-        plt.plot(data.frequencies, data.reference, label='reference')
-        plt.title('ODMR Spectrum')
-        plt.ylabel('fluorescence (arb)')
-        plt.xlabel('frequency (MHz)')
-        plt.legend()
-        
-        plt.savefig(folder_path + '/ODMR_Signal_and_Reference.png')
-        plt.clf()
-        
-        # plot the odmr contrast and save it
-        
-        plt.plot(data.frequencies, -data.odmr_contrast)
-        plt.title('ODMR Spectrum')
-        plt.ylabel('contrast (%)')
-        plt.xlabel('frequency (MHz)')
-        
-        plt.savefig(folder_path + '/ODMR_Contrast.png')
-        plt.clf()
-        
         # save the measurment configurations in a textfile
         
         with open(folder_path + '/Config.txt', "w") as file:
-            file.write('Readout time (us): ' + str(self.cfg.readout_integration_tus) + '\n')
-            file.write('Relax time (us): ' + str(self.cfg.relax_delay_tus) + '\n')
-            file.write('Repetitions: ' + str(self.cfg.reps) + '\n')
-            file.write('Laser power: ' + str(self.cfg.laser_power) + '\n')
-            file.write('MW gain: ' + str(self.cfg.mw_gain) + '\n')
-            file.write('MW start frequency: ' + str(self.cfg.mw_start_fMHz) + '\n')
-            file.write('MW end frequency: ' + str(self.cfg.mw_end_fMHz) + '\n')
-            file.write('Number of frequencies sampled: ' + str(self.cfg.nsweep_points) + '\n')
-            for config in additional_configs:
-                file.write(str(config[0]) + ': ' + str(config[1]) + '\n')
+            file.write(self.config_text + "".join(f"{config[0]}: {config[1]}\n" for config in additional_configs))
+
+        if not background:
+            self.save_plots(data, folder_path)
+            return None
+
+        plots = _save_pool.submit(self.save_plots, data, folder_path)
+        plots.add_done_callback(_warn_on_error)
+
+        return plots
+
+    def save_plots(self, data, folder_path):
+        '''
+        Method that writes the signal/reference and the odmr contrast plots into folder_path.
+        Figures are built without pyplot so this can run off the main thread
+
+        Parameters
+        ----------
+        data
+            The output of the analyze_results function
+        folder_path
+            Folder the plots are written to
+        '''
+        # plot the signal and reference and save it
+
+        fig = Figure()
+        ax = fig.subplots()
+        ax.plot(data.frequencies, data.signal, label='signal')
+        ax.plot(data.frequencies, data.reference, label='reference')
+        ax.set_title('ODMR Spectrum')
+        ax.set_ylabel('fluorescence (arb)')
+        ax.set_xlabel('frequency (MHz)')
+        ax.legend()
+
+        fig.savefig(folder_path + '/ODMR_Signal_and_Reference.png')
+
+        # plot the odmr contrast and save it
+
+        fig = Figure()
+        ax = fig.subplots()
+        ax.plot(data.frequencies, -data.odmr_contrast)
+        ax.set_title('ODMR Spectrum')
+        ax.set_ylabel('contrast (%)')
+        ax.set_xlabel('frequency (MHz)')
+
+        fig.savefig(folder_path + '/ODMR_Contrast.png')
@@ -426,25 +426,25 @@ class NVAveragerProgram(QickRegisterManagerMixin, QickProgram):
                 d.signal2 = data[:, :, 2]
                 d.reference2 = data[:, :, 3]
 
+        # average over all rounds and reps axes in a single reduction each
+        axes = tuple(range(d.signal1.ndim - 1))
+
         if self.data_shape[-1] == 2:
             d.contrast = ((d.signal1 - d.reference1) / d.reference1 * 100)
-            for _ in range(len(d.contrast.shape) - 1):
-                d.contrast = np.mean(d.contrast, axis=0)
-                d.signal1 = np.mean(d.signal1, axis=0)
-                d.reference1 = np.mean(d.reference1, axis=0)
+            d.contrast = np.mean(d.contrast, axis=axes)
+            d.signal1 = np.mean(d.signal1, axis=axes)
+            d.reference1 = np.mean(d.reference1, axis=axes)
         elif self.data_shape[-1] == 4:
             d.contrast1 = ((d.signal1 - d.reference1) / d.reference1 * 100)
             d.contrast2 = ((d.signal2 - d.reference2) / d.reference2 * 100)
             d.contrast = d.contrast1 - d.contrast2
-            for _ in range(len(d.contrast1.shape) - 1):
-                d.contrast1 = np.mean(d.contrast1, axis=0)
-                d.signal1 = np.mean(d.signal1, axis=0)
-
-                d.reference1 = np.mean(d.reference1, axis=0)
-                d.contrast2 = np.mean(d.contrast2, axis=0)
-                d.signal2 = np.mean(d.signal2, axis=0)
-                d.reference2 = np.mean(d.reference2, axis=0)
-                d.contrast = np.mean(d.contrast, axis=0)
+            d.contrast1 = np.mean(d.contrast1, axis=axes)
+            d.signal1 = np.mean(d.signal1, axis=axes)
+            d.reference1 = np.mean(d.reference1, axis=axes)
+            d.contrast2 = np.mean(d.contrast2, axis=axes)
+            d.signal2 = np.mean(d.signal2, axis=axes)
+            d.reference2 = np.mean(d.reference2, axis=axes)
+            d.contrast = np.mean(d.contrast, axis=axes)
 
         d.sweep_treg = self.qick_sweeps[0].get_sweep_pts()
         d.sweep_tus = self.qick_sweeps[0].get_sweep_pts() * self.cycles2us(1)
@@ -458,14 +458,8 @@ class NVAveragerProgram(QickRegisterManagerMixin, QickProgram):
 
         '''
 
-        missing_cfg = []
-
-        # loop checks if each required item is in self.cfg and adds missing variables to missing_cfg
-        for i in range(0, len(self.required_cfg)):
-            if self.required_cfg[i] in self.cfg:
-                pass
-            else:
-                missing_cfg.append(self.required_cfg[i])
+        # collects each required item that is not in self.cfg, in the order they are listed
+        missing_cfg = [item for item in self.required_cfg if item not in self.cfg]
 
         # assertion that values must be assigned to the missing items in self.cfg
         assert len(missing_cfg) == 0, \
@@ -20,18 +20,16 @@ except ModuleNotFoundError:
 import numpy as np
 from typing import List
 from ..util.itemattribute import ItemAttribute
-from datetime import datetime
+from .nvsavemixin import NVSaveMixin
 import serial
-import pickle
-import os 
 
 
-class NVAveragerProgram_johns(QickRegisterManagerMixin, QickProgram):
+class NVAveragerProgram_johns(NVSaveMixin, QickRegisterManagerMixin, QickProgram):
     """
     NVAveragerProgram class, for experiments that sweep over multiple variables
     in qick-dawg ordered in reps, sweep_n,... sweep_0.
 
-    Subclass of qick.QickRegisterManagerMixin and qick.QickProgram
+    Subclass of qickdawg.NVSaveMixin, qick.QickRegisterManagerMixin and qick.QickProgram
 
     Parameters
     --------------------------------------------------------------------------
@@ -446,25 +444,25 @@ class NVAveragerProgram_johns(QickRegisterManagerMixin, QickProgram):
                 d.signal2 = data[:, :, 2]
                 d.reference2 = data[:, :, 3]
 
+        # average over all rounds and reps axes in a single reduction each
+        axes = tuple(range(d.signal1.ndim - 1))
+
         if self.data_shape[-1] == 2:
             d.contrast = ((d.signal1 - d.reference1) / d.reference1 * 100)
-            for _ in range(len(d.contrast.shape) - 1):
-                d.contrast = np.mean(d.contrast, axis=0)
-                d.signal1 = np.mean(d.signal1, axis=0)
-                d.reference1 = np.mean(d.reference1, axis=0)
+            d.contrast = np.mean(d.contrast, axis=axes)
+            d.signal1 = np.mean(d.signal1, axis=axes)
+            d.reference1 = np.mean(d.reference1, axis=axes)
         elif self.data_shape[-1] == 4:
             d.contrast1 = ((d.signal1 - d.reference1) / d.reference1 * 100)
             d.contrast2 = ((d.signal2 - d.reference2) / d.reference2 * 100)
             d.contrast = d.contrast1 - d.contrast2
-            for _ in range(len(d.contrast1.shape) - 1):
-                d.contrast1 = np.mean(d.contrast1, axis=0)
-                d.signal1 = np.mean(d.signal1, axis=0)
-
-                d.reference1 = np.mean(d.reference1, axis=0)
-                d.contrast2 = np.mean(d.contrast2, axis=0)
-                d.signal2 = np.mean(d.signal2, axis=0)
-                d.reference2 = np.mean(d.reference2, axis=0)
-                d.contrast = np.mean(d.contrast, axis=0)
+            d.contrast1 = np.mean(d.contrast1, axis=axes)
+            d.signal1 = np.mean(d.signal1, axis=axes)
+            d.reference1 = np.mean(d.reference1, axis=axes)
+            d.contrast2 = np.mean(d.contrast2, axis=axes)
+            d.signal2 = np.mean(d.signal2, axis=axes)
+            d.reference2 = np.mean(d.reference2, axis=axes)
+            d.contrast = np.mean(d.contrast, axis=axes)
 
         d.sweep_treg = self.qick_sweeps[0].get_sweep_pts()
         d.sweep_tus = self.qick_sweeps[0].get_sweep_pts() * self.cycles2us(1)
@@ -478,14 +476,8 @@ class NVAveragerProgram_johns(QickRegisterManagerMixin, QickProgram):
 
         '''
 
-        missing_cfg = []
-
-        # loop checks if each required item is in self.cfg and adds missing variables to missing_cfg
-        for i in range(0, len(self.required_cfg)):
-            if self.required_cfg[i] in self.cfg:
-                pass
-            else:
-                missing_cfg.append(self.required_cfg[i])
+        # collects each required item that is not in self.cfg, in the order they are listed
+        missing_cfg = [item for item in self.required_cfg if item not in self.cfg]
 
         # assertion that values must be assigned to the missing items in self.cfg
         assert len(missing_cfg) == 0, \
@@ -493,54 +485,3 @@ class NVAveragerProgram_johns(QickRegisterManagerMixin, QickProgram):
 
         if self.cfg.mw_gain > 32767:
             assert self.cfg.mw_gain < 32767, "config.mw_gain should be between 0 and 32,767"
-            
-    def init_save(self, config, data, folder_path, folder_name = None, separate_dates = True):
-        
-        '''
-        Method that saves a file containing the raw data given as well as two graphs,
-        one of the odmr contrast and another showing the reference and signal
-        
-        Parameters
-        ----------
-        data
-            The raw data to be saved. Should be the output of the anaalyze_results function
-        foldername
-            The name of the file the data and plots will be saved in. If None it will be the data and time
-        
-        '''
-        
-        if separate_dates: # separates measurments into a separate folder for each date
-            folder_path = folder_path + '/' + str(datetime.now())[:10]
-                
-        if (not os.path.exists(folder_path)): # creates the folder for the current date if it doesn't exist
-            os.makedirs(folder_path)            
-        
-        if (folder_name == None): # sets folder name to the time the meaurment was saved if none was given
-            if separate_dates:
-                folder_name = str(datetime.now())[10:-7]
-            else:
-                folder_name = str(datetime.now())[:-7]
-                
-        folder_path = folder_path + '/' + folder_name
-        
-        if (os.path.exists(folder_path.replace('$', '_'))): # if a file with folder_name already exists, add numbers to the end until it doesnt                
-            folder_path = folder_path + '$1'
-            n = 2
-            while (os.path.exists(folder_path.replace('$', '_'))):
-                folder_path = folder_path.split('$')[0] + '$' + str(n)
-                n += 1
-        
-        folder_path = folder_path.replace('$', '_')
-        
-        print(folder_path)
-        os.makedirs(folder_path) # creates the folder too save the measurments in
-        
-        # save the data object as a pickle
-        
-        pickle.dump(data, open(folder_path + '/Data.pkl', 'wb'))
-        
-        # save the data object as a pickle
-        
-        pickle.dump(config, open(folder_path + '/Config.pkl', 'wb'))
-        
-        return folder_path
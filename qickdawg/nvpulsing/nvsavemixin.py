@@ -0,0 +1,83 @@
+"""
+NVSaveMixin
+==========================================================================
+A mixin class that gives qick-dawg programs a common way to create a
+measurement folder and save their data and configuration into it
+"""
+
+from datetime import datetime
+import pickle
+import os 
+
+
+class NVSaveMixin:
+    """
+    Mixin class providing init_save, which qick-dawg programs call at the start
+    of their save methods before writing plots and Config.txt
+
+    Methods
+    -------
+    init_save
+        creates the measurement folder and pickles the data and configuration into it
+    """
+
+    def init_save(self, config, data, folder_path, folder_name = None, separate_dates = True):
+        
+        '''
+        Method that creates the folder a measurement is saved in and pickles the data
+        and config into it as Data.pkl and Config.pkl
+        
+        Parameters
+        ----------
+        config
+            The configuration used to generate the data
+        data
+            The data to be saved. Should be the output of the analyze_results function
+        folder_path
+            Location of the folder the measurement folder is created in
+        folder_name
+            The name of the folder the data will be saved in. If None it will be the data and time
+        separate_dates
+            Boolean value which if true creates the measurement folder inside a folder for the current date
+
+        returns
+            (str) path of the folder the measurement was saved in
+        '''
+        
+        if separate_dates: # separates measurments into a separate folder for each date
+            folder_path = folder_path + '/' + str(datetime.now())[:10]
+                
+        if (not os.path.exists(folder_path)): # creates the folder for the current date if it doesn't exist
+            os.makedirs(folder_path)            
+        
+        if (folder_name == None): # sets folder name to the time the meaurment was saved if none was given
+            if separate_dates:
+                folder_name = str(datetime.now())[10:-7]
+            else:
+                folder_name = str(datetime.now())[:-7]
+                
+        folder_path = folder_path + '/' + folder_name
+        
+        if (os.path.exists(folder_path.replace('$', '_'))): # if a file with folder_name already exists, add numbers to the end until it doesnt                
+            folder_path = folder_path + '$1'
+            n = 2
+            while (os.path.exists(folder_path.replace('$', '_'))):
+                folder_path = folder_path.split('$')[0] + '$' + str(n)
+                n += 1
+        
+        folder_path = folder_path.replace('$', '_')
+        
+        print(folder_path)
+        os.makedirs(folder_path) # creates the folder too save the measurments in
+        
+        # save the data object as a pickle
+        
+        with open(folder_path + '/Data.pkl', 'wb') as file:
+            pickle.dump(data, file)
+        
+        # save the config object as a pickle
+        
+        with open(folder_path + '/Config.pkl', 'wb') as file:
+            pickle.dump(config, file)
+        
+        return folder_path
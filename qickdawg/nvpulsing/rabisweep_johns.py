@@ -11,15 +11,16 @@ from qick.averager_program import QickSweep
 from .nvqicksweep import NVQickSweep
 from .nvaverageprogram_johns import NVAveragerProgram_johns
 from ..util import ItemAttribute
-import qickdawg as qd
+from .sequencegraphics import GRAPHICS_FOLDER, load_graphic
 
 import numpy as np
 import matplotlib.pyplot as plt
-import matplotlib.image as mpimg
-from datetime import datetime
-import pickle
 import os 
-import serial
+
+
+# pulse sequence graphic used by plot_sequence
+_RABI_PNG = os.path.join(GRAPHICS_FOLDER, 'RABI.png')
+
 
 class RabiSweep_johns(NVAveragerProgram_johns):
     '''
@@ -79,7 +80,7 @@ class RabiSweep_johns(NVAveragerProgram_johns):
         returns the approximate total time for the entire program to complete
 
     '''
-    required_cfg = ["adc_channel",
+    required_cfg = ("adc_channel",
                     "readout_integration_treg",
                     "mw_channel",
                     "mw_nqz",
@@ -93,7 +94,7 @@ class RabiSweep_johns(NVAveragerProgram_johns):
                     "relax_delay_treg",
                     "reps",
                     "mw_delta_treg",
-                    ]
+                    )
 
     def initialize(self):
         '''
@@ -138,6 +139,13 @@ class RabiSweep_johns(NVAveragerProgram_johns):
                                    label='length',
                                    mw_channel=self.cfg.mw_channel))
 
+        # the sweep is fixed once the program is built, so compute its points once.
+        # Every result shares these arrays, so they are read-only
+        self.sweep_treg = np.asarray(self.qick_sweeps[0].get_sweep_pts())
+        self.sweep_tus = self.sweep_treg * self.cycles2us(1)
+        self.sweep_treg.flags.writeable = False
+        self.sweep_tus.flags.writeable = False
+
         self.synci(400)  # give processor some time to configure pulses
 
         if self.cfg.pre_init:
@@ -159,51 +167,61 @@ class RabiSweep_johns(NVAveragerProgram_johns):
         2. No micrwave pulse followed by readout and reference 
         '''
         
+        laser_initialize = self.cfg.laser_initialize_treg
+        readout_integration = self.cfg.readout_integration_treg
+        relax_delay = self.cfg.relax_delay_treg
+        mw_delay = self.cfg.mw_delay_treg
+        mw_end = self.cfg.mw_end_treg
+        adc_trig_offset = self.cfg.adc_trig_offset_treg
+        mw_channel = self.cfg.mw_channel
+        laser_pin = self.cfg.laser_gate_pmod
+        adc_channel = self.cfg.adc_channel
+
         t = 0
                 
         self.trigger(
             adcs=[],
-            pins=[self.cfg.laser_gate_pmod],
-            width=self.cfg.laser_initialize_treg,
+            pins=[laser_pin],
+            width=laser_initialize,
             adc_trig_offset=0,
             t=t)
         
-        t += self.cfg.laser_initialize_treg
+        t += laser_initialize
                         
-        self.pulse(ch=self.cfg.mw_channel, t=t)
+        self.pulse(ch=mw_channel, t=t)
 
         self.sync(self.mw_length_register.page, self.mw_length_register.addr) 
         
-        t += self.cfg.mw_delay_treg
+        t += mw_delay
         
         self.trigger(
-            adcs=[self.cfg.adc_channel],
-            pins=[self.cfg.laser_gate_pmod],
-            width=self.cfg.readout_integration_treg,
-            adc_trig_offset=self.cfg.adc_trig_offset_treg,
+            adcs=[adc_channel],
+            pins=[laser_pin],
+            width=readout_integration,
+            adc_trig_offset=adc_trig_offset,
             t=t)
         
-        t += self.cfg.readout_integration_treg
+        t += readout_integration
         
         self.trigger(
             adcs=[],
-            pins=[self.cfg.laser_gate_pmod],
-            width=self.cfg.laser_initialize_treg,
+            pins=[laser_pin],
+            width=laser_initialize,
             adc_trig_offset=0,
             t=t)
                         
-        t += self.cfg.mw_delay_treg
+        t += mw_delay
         
-        t += self.cfg.mw_delay_treg + self.cfg.mw_end_treg
+        t += mw_delay + mw_end
         
         self.trigger(
-            adcs=[self.cfg.adc_channel],
-            pins=[self.cfg.laser_gate_pmod],
-            width=self.cfg.readout_integration_treg,
-            adc_trig_offset=self.cfg.adc_trig_offset_treg,
+            adcs=[adc_channel],
+            pins=[laser_pin],
+            width=readout_integration,
+            adc_trig_offset=adc_trig_offset,
             t=t)
 
-        self.sync_all(self.cfg.relax_delay_treg)
+        self.sync_all(relax_delay)
         self.wait_all()
         
 
@@ -240,30 +258,28 @@ class RabiSweep_johns(NVAveragerProgram_johns):
                 - .contrast1 - .contrast2
         """
 
-        data = np.reshape(data, self.data_shape)
-        data = data / self.cfg.readout_integration_treg
+        # collapse rounds and reps into one axis so signal and reference are
+        # averaged together in a single contiguous pass over the data
+        data = np.ascontiguousarray(data).reshape(-1, self.cfg.nsweep_points, 2)
+        averaged = data.mean(axis=0)
+        signal = averaged[:, 0]
+        reference = averaged[:, 1]
 
-        if len(self.data_shape) == 2:
-            signal = data[:, 0]
-            reference = data[:, 1]
-        elif len(self.data_shape) == 3:
-            signal = data[:, :, 0]
-            reference = data[:, :, 1]
-        elif len(self.data_shape) == 4:
-            signal = data[:, :, :, 0]
-            reference = data[:, :, :, 1]
+        d = ItemAttribute()
 
-        for _ in range(len(signal.shape) - 1):
-            signal = np.mean(signal, axis=0)
-            reference = np.mean(reference, axis=0)
+        # (signal - reference) / reference * 100 computed in one buffer, the
+        # readout integration normalization cancels so the raw averages are used
+        d.contrast = np.subtract(signal, reference)
+        np.divide(d.contrast, reference, out=d.contrast)
+        d.contrast *= 100
 
-        d = ItemAttribute()
+        # normalize by the integration length for the signal outputs
+        averaged *= 1.0 / self.cfg.readout_integration_treg
         d.signal = signal
         d.reference = reference
-        d.contrast = (signal - reference) / reference * 100
 
-        d.sweep_treg = self.qick_sweeps[0].get_sweep_pts()
-        d.sweep_tus = self.qick_sweeps[0].get_sweep_pts() * self.cycles2us(1)
+        d.sweep_treg = self.sweep_treg
+        d.sweep_tus = self.sweep_tus
         
         return d
     
@@ -278,14 +294,10 @@ class RabiSweep_johns(NVAveragerProgram_johns):
             If None, this plots the squence with configuration labels
             If a `.NVConfiguration` object is supplied, the configuraiton value are added to the plot
         '''
-        graphics_folder = os.path.join(os.path.dirname(__file__), '../../graphics')
-        image_path = os.path.join(graphics_folder, 'RABI.png')
-
-
         if cfg is None:
             plt.figure(figsize=(15, 15))
             plt.axis('off')
-            plt.imshow(mpimg.imread(image_path))
+            plt.imshow(load_graphic(_RABI_PNG))
             plt.text(455, 510, "config.reps", fontsize=14)
             plt.text(350, 440, "config.laser_on", fontsize=14)
             plt.text(195, 580, " Sweep pi/2 pulse time linearly from config.mw_start to config.mw_end in config.mw_delta sized steps", fontsize=12)
@@ -300,10 +312,10 @@ class RabiSweep_johns(NVAveragerProgram_johns):
         else:
             plt.figure(figsize=(15, 15))
             plt.axis('off')
-            plt.imshow(mpimg.imread(image_path))
+            plt.imshow(load_graphic(_RABI_PNG))
             plt.text(420, 510, "Repeat {} times".format(cfg.reps), fontsize=14)
-            plt.text(350, 440, "laser_on_tus = {} us".format(str(cfg.laser_on_tus)[:4]), fontsize=14)
-            plt.text(195, 580, " Sweep pi/2 pulse time linearly from {} time register to {} time register in steps of {} time register".format(int(cfg.mw_start_treg), int(cfg.mw_end_treg), str(cfg.mw_delta_treg)[:4]), fontsize=12)
+            plt.text(350, 440, "laser_on_tus = {:g} us".format(cfg.laser_on_tus), fontsize=14)
+            plt.text(195, 580, " Sweep pi/2 pulse time linearly from {} time register to {} time register in steps of {} time register".format(int(cfg.mw_start_treg), int(cfg.mw_end_treg), int(cfg.mw_delta_treg)), fontsize=12)
             plt.text(265, 370, "readout_integration  \n       = {} ns".format(int(cfg.readout_integration_tns)), fontsize=14)
             plt.text(527, 370, "readout_integration  \n      = {} ns".format(int(cfg.readout_integration_tns)), fontsize=14)
             plt.text(190, 368, " pi/2\npulse", fontsize=14)
@@ -337,43 +349,46 @@ class RabiSweep_johns(NVAveragerProgram_johns):
         
         folder_path = self.init_save(self.cfg, data, folder_path, folder_name, separate_dates)
         
-        # plot the signal and save it
+        # plot the signal and save it, then reuse the same figure for the contrast
         
-        plt.plot(data.sweep_tus, data.signal, label='signal')
+        fig, ax = plt.subplots()
+        ax.plot(data.sweep_tus, data.signal, label='signal')
 
-        plt.legend()
-        plt.title('Rabi Oscillations')
-        plt.ylabel('PL Intensity (arb)')
-        plt.xlabel('pulse time (us)')
+        ax.legend()
+        ax.set_title('Rabi Oscillations')
+        ax.set_ylabel('PL Intensity (arb)')
+        ax.set_xlabel('pulse time (us)')
         
-        plt.savefig(folder_path + '/Rabi_Sweep_Signal_and_Reference.png')
-        plt.clf()
+        fig.savefig(folder_path + '/Rabi_Sweep_Signal_and_Reference.png')
+        ax.clear()
         
         # plot the contrast and save it
         
-        plt.plot(data.sweep_tus, data.contrast, label='signal')
+        ax.plot(data.sweep_tus, data.contrast, label='signal')
 
-        plt.legend()
-        plt.title('Rabi Oscillations')
-        plt.ylabel('Contrast (%)')
-        plt.xlabel('pulse time (us)')
+        ax.legend()
+        ax.set_title('Rabi Oscillations')
+        ax.set_ylabel('Contrast (%)')
+        ax.set_xlabel('pulse time (us)')
         
-        plt.savefig(folder_path + '/Rabi_Contrast_and_Reference.png')
-        plt.clf()
+        fig.savefig(folder_path + '/Rabi_Contrast_and_Reference.png')
+        plt.close(fig)
         
         # save the measurment configurations in a textfile
         
+        lines = [
+            f"Readout time (us): {self.cfg.readout_integration_tus}",
+            f"Relax time (us): {self.cfg.relax_delay_tus}",
+            f"Mw delay time (us): {self.cfg.mw_delay_tus}",
+            f"Laser intialize time (us): {self.cfg.laser_initialize_tus}",
+            f"Repetitions: {self.cfg.reps}",
+            f"Laser power: {self.cfg.laser_power}",
+            f"MW gain: {self.cfg.mw_gain}",
+            f"MW start time (us): {self.cfg.mw_start_tus}",
+            f"MW end time (us): {self.cfg.mw_end_tus}",
+            f"Number of sweep times sampled: {self.cfg.nsweep_points}",
+        ] + [f"{config[0]}: {config[1]}" for config in additional_configs]
+
         with open(folder_path + '/Config.txt', "w") as file:
-            file.write('Readout time (us): ' + str(self.cfg.readout_integration_tus) + '\n')
-            file.write('Relax time (us): ' + str(self.cfg.relax_delay_tus) + '\n')
-            file.write('Mw delay time (us): ' + str(self.cfg.mw_delay_tus) + '\n')
-            file.write('Laser intialize time (us): ' + str(self.cfg.laser_initialize_tus) + '\n')
-            file.write('Repetitions: ' + str(self.cfg.reps) + '\n')
-            file.write('Laser power: ' + str(self.cfg.laser_power) + '\n')
-            file.write('MW gain: ' + str(self.cfg.mw_gain) + '\n')
-            file.write('MW start time (us): ' + str(self.cfg.mw_start_tus) + '\n')
-            file.write('MW end time (us): ' + str(self.cfg.mw_end_tus) + '\n')
-            file.write('Number of sweep times sampled: ' + str(self.cfg.nsweep_points) + '\n')
-            for config in additional_configs:
-                file.write(str(config[0]) + ': ' + str(config[1]) + '\n')
+            file.write("\n".join(lines) + "\n")
 
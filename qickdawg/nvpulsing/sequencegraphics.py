@@ -0,0 +1,32 @@
+'''
+sequencegraphics
+=======================================================================
+Location of the pulse sequence graphics drawn by the plot_sequence methods
+and a cached loader for them
+'''
+
+import matplotlib.image as mpimg
+import os
+from functools import lru_cache
+
+
+GRAPHICS_FOLDER = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..', 'graphics'))
+
+
+@lru_cache(maxsize=16)
+def load_graphic(path):
+    '''
+    Function that reads a pulse sequence graphic, decoding each file once per process
+
+    Parameters
+    ----------
+    path
+        path to the image, usually os.path.join(GRAPHICS_FOLDER, <name>.png)
+
+    returns
+        (np.array) read-only image data for plt.imshow, shared between calls
+    '''
+    image = mpimg.imread(path)
+    image.flags.writeable = False
+
+    return image
@@ -8,13 +8,22 @@ on and off acquire contrasted measurements
 
 
 from .nvaverageprogram import NVAveragerProgram
+from .nvsavemixin import NVSaveMixin
 from .nvqicksweep import NVQickSweep
+from ..fitfunctions import exponential_decay
+from .sequencegraphics import GRAPHICS_FOLDER, load_graphic
+from scipy.optimize import curve_fit
 
+import numpy as np
 import matplotlib.pyplot as plt
-import matplotlib.image as mpimg
 import os 
 
-class T1DelaySweep(NVAveragerProgram):
+
+# pulse sequence graphic used by plot_sequence
+_T1_PNG = os.path.join(GRAPHICS_FOLDER, 'T1.png')
+
+
+class T1DelaySweep(NVSaveMixin, NVAveragerProgram):
     '''
     An NVAveragerProgram class that generates and executes a sequence used
     to measure the T1 Decay
@@ -68,7 +77,7 @@ class T1DelaySweep(NVAveragerProgram):
     total_time
         returns the approximate total time for the entire program to complete
     '''
-    required_cfg = [
+    required_cfg = (
         "adc_channel",
         "readout_integration_treg",
         "mw_channel",
@@ -86,7 +95,7 @@ class T1DelaySweep(NVAveragerProgram):
         "reps",
         "readout_reference_start_treg",
         "laser_readout_offset_treg",
-        "mw_readout_delay_treg"]
+        "mw_readout_delay_treg")
 
     def initialize(self):
         '''
@@ -164,28 +173,35 @@ class T1DelaySweep(NVAveragerProgram):
         6. Loop over rounds
         '''
 
+        mw_channel = self.cfg.mw_channel
+        mw_readout_delay = self.cfg.mw_readout_delay_treg
+        # the pi pulse is two back to back pi/2 pulses
+        pi2_length = self.cfg.mw_pi2_treg
+        pi_length = 2 * pi2_length
+
         ## First pulse sequence
         ## pi(x) - delay - readout
         # pi2(x)
-        self.pulse(ch=self.cfg.mw_channel, t=0)
-        self.pulse(ch=self.cfg.mw_channel, t=self.cfg.mw_pi2_treg)
-        self.synci(self.cfg.mw_pi2_treg * 2)
+        self.pulse(ch=mw_channel, t=0)
+        self.pulse(ch=mw_channel, t=pi2_length)
+        self.synci(pi_length)
         # delay
         self.sync(self.delay_register.page, self.delay_register.addr)
         # readout
-        self.sync_all(self.cfg.mw_readout_delay_treg)        
+        self.sync_all(mw_readout_delay)        
         self.ttl_readout()
         
         ## Second pulse sequence
         ## pi(x) off - delay - readout
         ## Second pulse sequence
         ## Nothing - delay - readout
-        # pi(x) - off
-        self.synci(self.cfg.mw_pi2_treg * 2)
+        # pi(x) - off, wait out the pi pulse duration with the microwave off
+        # so both sequences have the same timing
+        self.synci(pi_length)
         # delay
         self.sync(self.delay_register.page, self.delay_register.addr) 
         # readout
-        self.sync_all(self.cfg.mw_readout_delay_treg)
+        self.sync_all(mw_readout_delay)
         self.ttl_readout()
     
     def acquire(self, raw_data=False, *arg, **kwarg):
@@ -194,7 +210,7 @@ class T1DelaySweep(NVAveragerProgram):
 
         if raw_data is False:
             data = self.analyze_pulse_sequence_results(data)
-            data.contrast = data.contrast * -1
+            np.negative(data.contrast, out=data.contrast)
 
         return data
 
@@ -208,14 +224,10 @@ class T1DelaySweep(NVAveragerProgram):
             If None, this plots the squence with configuration labels
             If a `.NVConfiguration` object is supplied, the configuraiton value are added to the plot
         '''
-        graphics_folder = os.path.join(os.path.dirname(__file__), '../../graphics')
-        image_path = os.path.join(graphics_folder, 'T1.png')
-
-
         if cfg is None:
             plt.figure(figsize=(12, 12))
             plt.axis('off')
-            plt.imshow(mpimg.imread(image_path))
+            plt.imshow(load_graphic(_T1_PNG))
             plt.text(500, 700, "config.reps", fontsize=14)
       
             plt.text(305, 335, "delay", fontsize=10)
@@ -232,15 +244,15 @@ class T1DelaySweep(NVAveragerProgram):
         else:
             plt.figure(figsize=(12, 12))
             plt.axis('off')
-            plt.imshow(mpimg.imread(image_path))
+            plt.imshow(load_graphic(_T1_PNG))
             plt.text(450, 700, "Repeat {} times".format(cfg.reps), fontsize=14)
             plt.text(305, 335, "delay", fontsize=10)
             plt.text(400, 385, "  config.readout_reference_start", fontsize=10)
             plt.text(250, 335, "pi", fontsize=10)
             plt.text(240, 465, "laser_readout_offset = {} treg".format(cfg.laser_readout_offset_treg), fontsize=10)
-            plt.text(390, 337, "readout_integration = {} us".format(str(cfg.readout_integration_tus)[:4]), fontsize=10)
-            plt.text(650, 357, "readout_integration \n = {} us".format(str(cfg.readout_integration_tus)[:4]), fontsize=10)
-            plt.text(850, 357, "relax_delay \n = {} us".format(str(cfg.relax_delay_tus)[:4]), fontsize=10)
+            plt.text(390, 337, "readout_integration = {:g} us".format(cfg.readout_integration_tus), fontsize=10)
+            plt.text(650, 357, "readout_integration \n = {:g} us".format(cfg.readout_integration_tus), fontsize=10)
+            plt.text(850, 357, "relax_delay \n = {:g} us".format(cfg.relax_delay_tus), fontsize=10)
             plt.text(400, 430, "laser_on = {} us".format(cfg.laser_on_tus), fontsize=12)
             plt.text(325, 605, "    Sweep delay from {} us to {} us \n                in {} {} steps".format(int(cfg.delay_start_tns), int(cfg.delay_end_tns), cfg.nsweep_points, cfg.scaling_mode), fontsize=12)
             plt.title("               T1 Pulse Sequence", fontsize=20)
@@ -274,35 +286,39 @@ class T1DelaySweep(NVAveragerProgram):
         
         p0 = [0.6, 5e3, 0]
 
-        plt.plot(data.sweep_tus, data.contrast)
-        #plt.plot(d.sweep_tus, qd.exponential_decay(d.sweep_tus, *p0))
+        fig, ax = plt.subplots()
+        ax.plot(data.sweep_tus, data.contrast)
+        #ax.plot(data.sweep_tus, exponential_decay(data.sweep_tus, *p0))
 
-        param, _ = curve_fit(qd.exponential_decay, data.sweep_tus, data.contrast, p0)
-        plt.plot(d.sweep_tus, qd.exponential_decay(data.sweep_tus, *param))
+        param, _ = curve_fit(exponential_decay, data.sweep_tus, data.contrast, p0)
+        model = exponential_decay(data.sweep_tus, *param)
+        ax.plot(data.sweep_tus, model)
 
-        plt.xscale('log')
-        # plt.xlim(1, )
+        ax.set_xscale('log')
+        # ax.set_xlim(1, )
         print('T1 is approximatel {:0f} ms'.format(param[1]/1e3))
-        plt.title('T1 Relaxation')
-        plt.ylabel('Contrast (%)')
-        plt.xlabel('Delay (us)')
+        ax.set_title('T1 Relaxation')
+        ax.set_ylabel('Contrast (%)')
+        ax.set_xlabel('Delay (us)')
         
         
-        plt.savefig(folder_path + '/Rabi_Contrast_and_Reference.png')
-        plt.clf()
+        fig.savefig(folder_path + '/Rabi_Contrast_and_Reference.png')
+        plt.close(fig)
         
         # save the measurment configurations in a textfile
         
+        lines = [
+            f"Readout time (us): {self.cfg.readout_integration_tus}",
+            f"Laser on time (us): {self.cfg.laser_on_tus}",
+            f"Laser readout offset (us): {self.cfg.laser_readout_offset_tus}",
+            f"Readout reference start time (us): {self.cfg.readout_reference_start_tus}",
+            f"Repetitions: {self.cfg.reps}",
+            f"Laser power  (arb): {self.cfg.laser_power}",
+            f"MW gain (arb): {self.cfg.mw_gain}",
+            f"Pi/2 pulse length (ns): {self.cfg.mw_pi2_tns}",
+            f"MW frequency (MHz): {self.cfg.mw_fMHz}",
+        ] + [f"{config[0]}: {config[1]}" for config in additional_configs]
+
         with open(folder_path + '/Config.txt', "w") as file:
-            file.write('Readout time (us): ' + str(self.cfg.readout_integration_tus) + '\n')
-            file.write('Laser on time (us): ' + str(self.cfg.laser_on_tus) + '\n')
-            file.write('Laser readout offset (us): ' + str(self.cfg.laser_readout_offset_tus) + '\n')
-            file.write('Readout reference start time (us): ' + str(self.cfg.readout_reference_start_tus) + '\n')
-            file.write('Repetitions: ' + str(self.cfg.reps) + '\n')
-            file.write('Laser power  (arb): ' + str(self.cfg.laser_power) + '\n')
-            file.write('MW gain (arb): ' + str(self.cfg.mw_gain) + '\n')
-            file.write('Pi/2 pulse length (ns): ' + str(self.cfg.mw_pi2_tns) + '\n')
-            file.write('MW frequency (MHz): ' + str(self.cfg.mw_fMHz) + '\n')
-            for config in additional_configs:
-                file.write(str(config[0]) + ': ' + str(config[1]) + '\n')
+            file.write("\n".join(lines) + "\n")
 
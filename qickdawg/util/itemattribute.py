@@ -21,12 +21,15 @@ class ItemAttribute(object):
 
     Args:
         dictionary - (default None) dictionary object
+        **kwargs - additional attributes, set after those in dictionary
     '''
 
-    def __init__(self, dictionary=None):
+    def __init__(self, dictionary=None, **kwargs):
         if dictionary is not None:
             for k in dictionary.keys():
                 self[k] = dictionary[k]
+        for k, v in kwargs.items():
+            self[k] = v
 
     __getitem__ = object.__getattribute__
     __setitem__ = object.__setattr__